@@ -6,11 +6,14 @@
 
 from __future__ import annotations
 
+import fcntl
 import importlib.metadata
 import json
 import logging
 import os
 import subprocess
+import time
+import zlib
 from collections.abc import Iterable
 
 from airflow import DAG
@@ -51,12 +54,21 @@ if not Path(PROJECT_ROOT).joinpath(MELTANO_BIN).exists():
     )
     MELTANO_BIN = "meltano"
 
+# Version of the interface shard stubs rely on, `create_dags(shard_index, shard_count, namespace)`.
+# `airflow_extension initialize --shards` refuses to install stubs next to a generator without it.
+SHARD_SUPPORT = 1
 
-def _meltano_elt_generator(schedules: list) -> None:
+# Shard stubs share a single `meltano schedule list` call through this cached export.
+SCHEDULE_EXPORT_CACHE = Path(PROJECT_ROOT).joinpath(".meltano/run/airflow/schedule_export.json")
+SCHEDULE_EXPORT_CACHE_TTL = float(os.getenv("MELTANO_SCHEDULE_EXPORT_CACHE_TTL", "30"))
+
+
+def _meltano_elt_generator(schedules: list, namespace: dict) -> None:
     """Generate singular dag's for each legacy Meltano elt task.
 
     Args:
         schedules (list): List of Meltano schedules.
+        namespace (dict): Module namespace to register the DAGs in.
     """
     for schedule in schedules:
         logger.info(f"Considering schedule '{schedule['name']}': {schedule}")
@@ -109,15 +121,16 @@ def _meltano_elt_generator(schedules: list) -> None:
         )
 
         # register the dag
-        globals()[dag_id] = dag
+        namespace[dag_id] = dag
         logger.info(f"DAG created for schedule '{schedule['name']}'")
 
 
-def _meltano_job_generator(schedules: list) -> None:
+def _meltano_job_generator(schedules: list, namespace: dict) -> None:
     """Generate dag's for each task within a Meltano scheduled job.
 
     Args:
         schedules (list): List of Meltano scheduled jobs.
+        namespace (dict): Module namespace to register the DAGs in.
     """
     for schedule in schedules:
         if not schedule.get("job"):
@@ -179,12 +192,12 @@ def _meltano_job_generator(schedules: list) -> None:
                 previous_task = task
                 logger.info("Spun off task '%s' of schedule '%s': %s", task, schedule["name"], schedule)
 
-        globals()[base_id] = dag
+        namespace[base_id] = dag
         logger.info(f"DAG created for schedule '{schedule['name']}', task='{run_args}'")
 
 
-def create_dags() -> None:
-    """Create DAGs for Meltano schedules."""
+def _fetch_schedule_export() -> list | dict:
+    """Run `meltano schedule list` and return the parsed export."""
     list_result = subprocess.run(
         [MELTANO_BIN, "schedule", "list", "--format=json"],
         cwd=PROJECT_ROOT,
@@ -192,15 +205,89 @@ def create_dags() -> None:
         text=True,
         check=True,
     )
-    schedule_export = json.loads(list_result.stdout)
+    return json.loads(list_result.stdout)
+
+
+def _schedule_export_is_fresh() -> bool:
+    """Check whether the cached schedule export can be reused.
+
+    Only meltano.yml is checked, files from its `include_paths` would need a YAML parser.
+    Edits to those are picked up after the TTL, or immediately by `airflow_extension watch`.
+    """
+    try:
+        cache_mtime = SCHEDULE_EXPORT_CACHE.stat().st_mtime
+    except FileNotFoundError:
+        return False
+    meltano_yml = Path(PROJECT_ROOT).joinpath("meltano.yml")
+    if meltano_yml.exists() and meltano_yml.stat().st_mtime > cache_mtime:
+        return False
+    return time.time() - cache_mtime < SCHEDULE_EXPORT_CACHE_TTL
+
+
+def _cached_schedule_export() -> list | dict:
+    """Return the schedule export, fetching it at most once per TTL across all shards."""
+    if _schedule_export_is_fresh():
+        return json.loads(SCHEDULE_EXPORT_CACHE.read_text())
+
+    SCHEDULE_EXPORT_CACHE.parent.mkdir(parents=True, exist_ok=True)
+    lock_path = SCHEDULE_EXPORT_CACHE.with_suffix(".lock")
+    with lock_path.open("w") as lock:
+        # shards are parsed concurrently, so only the first one to get here runs meltano
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        if _schedule_export_is_fresh():
+            return json.loads(SCHEDULE_EXPORT_CACHE.read_text())
+
+        schedule_export = _fetch_schedule_export()
+        tmp_path = SCHEDULE_EXPORT_CACHE.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(schedule_export))
+        os.replace(tmp_path, SCHEDULE_EXPORT_CACHE)
+    return schedule_export
+
+
+def schedule_shard(schedule_name: str, shard_count: int) -> int:
+    """Return the shard a schedule belongs to.
+
+    Uses a stable hash so every DAG processor agrees on the assignment.
+
+    Args:
+        schedule_name (str): Name of the Meltano schedule.
+        shard_count (int): Total number of shards.
+
+    Returns:
+        The zero-based shard index.
+    """
+    return zlib.crc32(schedule_name.encode()) % shard_count
+
+
+def create_dags(shard_index: int = 0, shard_count: int = 1, namespace: dict | None = None) -> None:
+    """Create DAGs for Meltano schedules.
+
+    Args:
+        shard_index (int): Zero-based index of the shard to build.
+        shard_count (int): Total number of shards, 1 builds every schedule.
+        namespace (dict): Module namespace to register the DAGs in, defaults to this module.
+    """
+    if namespace is None:
+        namespace = globals()
+
+    if shard_count > 1:
+        schedule_export = _cached_schedule_export()
+    else:
+        schedule_export = _fetch_schedule_export()
+
+    def _in_shard(schedules: list | None) -> list:
+        return [s for s in schedules or [] if schedule_shard(s["name"], shard_count) == shard_index]
 
     if isinstance(schedule_export, dict) and schedule_export.get("schedules"):
         logger.info(f"Received meltano v2 style schedule export: {schedule_export}")
-        _meltano_elt_generator(schedule_export["schedules"].get("elt"))
-        _meltano_job_generator(schedule_export["schedules"].get("job"))
+        _meltano_elt_generator(_in_shard(schedule_export["schedules"].get("elt")), namespace)
+        _meltano_job_generator(_in_shard(schedule_export["schedules"].get("job")), namespace)
     else:
         logger.info(f"Received meltano v1 style schedule export: {schedule_export}")
-        _meltano_elt_generator(schedule_export)
+        _meltano_elt_generator(_in_shard(schedule_export), namespace)
 
 
-create_dags()
+# Shard stubs import this module by name and build their own slice of the schedules. When
+# Airflow parses this file directly it is loaded under a mangled module name instead.
+if __name__ != "meltano_dag_generator":
+    create_dags()
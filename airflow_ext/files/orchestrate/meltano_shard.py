@@ -0,0 +1,22 @@
+"""Meltano DAG generator shard."""
+
+# Installed as `meltano_dag_generator_shard_<index>_of_<count>.py` by
+# `airflow_extension initialize --shards <count>`. Each shard only builds the
+# Meltano schedules that hash to it, so Airflow can parse the shards in parallel.
+# The DAG generation itself lives in `meltano_dag_generator.py`. The file name
+# format must match `shard_file_name` in `airflow_ext.watcher`.
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+DAGS_FOLDER = str(Path(__file__).parent)
+if DAGS_FOLDER not in sys.path:
+    sys.path.insert(0, DAGS_FOLDER)
+
+from meltano_dag_generator import create_dags  # noqa: E402
+
+_, _, SHARD_INDEX, _, SHARD_COUNT = Path(__file__).stem.rsplit("_", 4)
+
+create_dags(int(SHARD_INDEX), int(SHARD_COUNT), globals())
@@ -21,7 +21,17 @@ app = typer.Typer(pretty_exceptions_enable=False, rich_markup_mode=None)
 
 
 @app.command()
-def initialize(ctx: typer.Context, force: bool = False) -> None:
+def initialize(
+    ctx: typer.Context,
+    force: bool = False,
+    shards: int | None = typer.Option(
+        None,
+        "--shards",
+        min=1,
+        help="Split the meltano dag generator into this many shards that Airflow can parse in parallel, "
+        "1 to go back to a single file. The current layout is kept when omitted.",
+    ),
+) -> None:
     """Initialize the plugin.
 
     This will create the airflow.cfg, initialize the database, and install the meltano
@@ -30,14 +40,33 @@ def initialize(ctx: typer.Context, force: bool = False) -> None:
     Args:
         ctx: The typer context. Unused.
         force: If True, force initialization.
+        shards: Number of dag generator shards to install, None keeps the current layout.
     """
     try:
-        ext.initialize(force)
+        ext.initialize(force, shards)
     except Exception:
         log.exception("initialize failed with uncaught exception, please report to maintainer")
         sys.exit(1)
 
 
+@app.command()
+def watch(
+    poll_interval: float = typer.Option(1.0, "--poll-interval", min=0.1, help="Seconds between checks for changes"),
+    debounce: float = typer.Option(2.0, "--debounce", min=0, help="Seconds to wait for edits to settle"),
+) -> None:
+    """Watch meltano.yml and its include files, refreshing the affected DAGs on change.
+
+    Args:
+        poll_interval: Seconds between checks of the watched files.
+        debounce: Seconds the watched files must stay unchanged before refreshing.
+    """
+    try:
+        ext.watch(poll_interval, debounce)
+    except Exception:
+        log.exception("watch failed with uncaught exception, please report to maintainer")
+        sys.exit(1)
+
+
 @app.command(context_settings={"allow_extra_args": True, "ignore_unknown_options": True})
 def invoke(ctx: typer.Context, command_args: list[str]) -> None:
     """Invoke the underlying wrapped cli.
@@ -0,0 +1,246 @@
+"""Watch a Meltano project for schedule changes and nudge Airflow to re-parse the affected DAGs."""
+
+from __future__ import annotations
+
+import fcntl
+import glob
+import json
+import os
+import re
+import subprocess
+import time
+import zlib
+from pathlib import Path
+
+import structlog
+import yaml
+from meltano.edk.process import Invoker, log_subprocess_error
+
+log = structlog.get_logger("airflow_extension")
+
+SCHEDULE_EXPORT_CACHE = ".meltano/run/airflow/schedule_export.json"
+DAG_GENERATOR_NAME = "meltano_dag_generator.py"
+DAG_GENERATOR_SHARD_GLOB = "meltano_dag_generator_shard_*_of_*.py"
+# Must match the file name parsing in the bundled shard stub.
+DAG_GENERATOR_SHARD_PATTERN = re.compile(r"meltano_dag_generator_shard_(\d+)_of_(\d+)\.py")
+
+# Schedule fields the dag generator builds DAGs from. Anything else, such as the run state
+# meltano reports for elt schedules, changes without affecting the DAGs.
+DAG_SCHEDULE_FIELDS = ("name", "extractor", "loader", "transform", "interval", "cron_interval", "start_date", "job")
+
+
+def shard_file_name(shard_index: int, shard_count: int) -> str:
+    """Return the file name of a dag generator shard stub.
+
+    Args:
+        shard_index: Zero-based index of the shard.
+        shard_count: Total number of shards.
+
+    Returns:
+        The stub file name.
+    """
+    return f"meltano_dag_generator_shard_{shard_index}_of_{shard_count}.py"
+
+
+def parse_shard_file_name(file_name: str) -> tuple[int, int] | None:
+    """Parse the shard index and count out of a dag generator shard stub file name.
+
+    Args:
+        file_name: The file name to parse.
+
+    Returns:
+        The shard index and count, or None if this is not a shard stub.
+    """
+    match = DAG_GENERATOR_SHARD_PATTERN.fullmatch(file_name)
+    if not match:
+        return None
+    shard_index, shard_count = int(match[1]), int(match[2])
+    if shard_index >= shard_count:
+        return None
+    return shard_index, shard_count
+
+
+def schedule_shard(schedule_name: str, shard_count: int) -> int:
+    """Return the shard a schedule belongs to.
+
+    Must match `schedule_shard` in the bundled dag generator.
+
+    Args:
+        schedule_name: Name of the Meltano schedule.
+        shard_count: Total number of shards.
+
+    Returns:
+        The zero-based shard index.
+    """
+    return zlib.crc32(schedule_name.encode()) % shard_count
+
+
+def _schedules_by_name(schedule_export: list | dict) -> dict[str, dict]:
+    """Flatten a v1 or v2 `meltano schedule list` export into the DAG fields of each schedule, keyed by name."""
+    if isinstance(schedule_export, dict) and schedule_export.get("schedules"):
+        schedules = [
+            *(schedule_export["schedules"].get("elt") or []),
+            *(schedule_export["schedules"].get("job") or []),
+        ]
+    else:
+        schedules = schedule_export or []
+    return {
+        schedule["name"]: {field: schedule[field] for field in DAG_SCHEDULE_FIELDS if field in schedule}
+        for schedule in schedules
+    }
+
+
+class ScheduleWatcher:
+    """Refresh the schedule export and touch affected DAG files when meltano.yml changes."""
+
+    def __init__(self, project_root: Path, dags_path: Path) -> None:
+        """Initialize the watcher.
+
+        Args:
+            project_root: The Meltano project root.
+            dags_path: The Airflow dags folder the meltano dag generator is installed in.
+        """
+        self.project_root = project_root
+        self.dags_path = dags_path
+        self.schedule_export_cache = project_root / SCHEDULE_EXPORT_CACHE
+
+        meltano_bin = project_root / ".meltano/run/bin"
+        self.meltano_invoker = Invoker(str(meltano_bin) if meltano_bin.exists() else "meltano", cwd=str(project_root))
+
+        self.schedules: dict[str, dict] | None = None
+        if self.schedule_export_cache.exists():
+            try:
+                self.schedules = _schedules_by_name(json.loads(self.schedule_export_cache.read_text()))
+            except (json.JSONDecodeError, KeyError, TypeError):
+                log.debug("ignoring unreadable schedule export cache", path=self.schedule_export_cache)
+
+    def watched_paths(self) -> list[Path]:
+        """Return meltano.yml and the files matched by its `include_paths`.
+
+        Returns:
+            The paths to watch for changes.
+        """
+        meltano_yml = self.project_root / "meltano.yml"
+        paths = [meltano_yml]
+        try:
+            config = yaml.safe_load(meltano_yml.read_text()) or {}
+        except (OSError, yaml.YAMLError):
+            # keep watching meltano.yml itself, the include paths are picked up once it is valid again
+            return paths
+
+        for pattern in config.get("include_paths") or []:
+            matches = glob.glob(os.path.join(self.project_root, pattern), recursive=True)
+            paths.extend(Path(match) for match in sorted(matches))
+        return paths
+
+    def _snapshot(self) -> dict[Path, tuple[int, int] | None]:
+        """Stat every watched path."""
+        snapshot: dict[Path, tuple[int, int] | None] = {}
+        for path in self.watched_paths():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                snapshot[path] = None
+            else:
+                snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def _dag_files_for(self, schedule_names: set[str]) -> list[Path]:
+        """Return the installed generator files that build any of the given schedules."""
+        if not schedule_names:
+            return []
+
+        shards = {}
+        for shard_path in sorted(self.dags_path.glob(DAG_GENERATOR_SHARD_GLOB)):
+            shard = parse_shard_file_name(shard_path.name)
+            if shard is None:
+                log.debug("skipping file that is not a meltano dag generator shard", path=shard_path)
+                continue
+            shards[shard_path] = shard
+
+        if not shards:
+            dag_generator_path = self.dags_path / DAG_GENERATOR_NAME
+            return [dag_generator_path] if dag_generator_path.exists() else []
+
+        return [
+            shard_path
+            for shard_path, (shard_index, shard_count) in shards.items()
+            if any(schedule_shard(name, shard_count) == shard_index for name in schedule_names)
+        ]
+
+    def refresh(self) -> list[Path]:
+        """Refresh the cached schedule export and touch the DAG files of changed schedules.
+
+        Airflow re-parses recently modified files ahead of its `min_file_process_interval`,
+        so touching a file is enough to get its DAGs updated.
+
+        Returns:
+            The DAG files that were touched.
+        """
+        try:
+            self.schedule_export_cache.parent.mkdir(parents=True, exist_ok=True)
+            with self.schedule_export_cache.with_suffix(".lock").open("w") as lock:
+                # same lock the dag generator shards take, so a shard that started fetching
+                # before the edit cannot overwrite the fresh export with a stale one
+                fcntl.flock(lock, fcntl.LOCK_EX)
+                proc = self.meltano_invoker.run("schedule", "list", "--format=json", stdout=subprocess.PIPE)
+                schedule_export = json.loads(proc.stdout)
+
+                tmp_path = self.schedule_export_cache.with_suffix(f".{os.getpid()}.tmp")
+                tmp_path.write_text(json.dumps(schedule_export))
+                os.replace(tmp_path, self.schedule_export_cache)
+            schedules = _schedules_by_name(schedule_export)
+        except subprocess.CalledProcessError as err:
+            log_subprocess_error("meltano schedule list", err, "unable to refresh meltano schedules")
+            return []
+        except json.JSONDecodeError:
+            log.exception("meltano schedule list returned invalid json")
+            return []
+        except (KeyError, TypeError):
+            log.exception("meltano schedule list returned an unexpected export")
+            return []
+        except OSError:
+            log.exception("unable to refresh meltano schedules")
+            return []
+
+        previous, self.schedules = self.schedules, schedules
+        if previous is None:
+            return []
+
+        changed = {name for name in previous.keys() | schedules.keys() if previous.get(name) != schedules.get(name)}
+        affected = self._dag_files_for(changed)
+        for dag_file in affected:
+            os.utime(dag_file)
+        if changed:
+            log.info("meltano schedules changed", schedules=sorted(changed), touched=[str(p) for p in affected])
+        return affected
+
+    def run(self, poll_interval: float = 1.0, debounce: float = 2.0) -> None:
+        """Watch the project until interrupted.
+
+        Args:
+            poll_interval: Seconds between checks of the watched files.
+            debounce: Seconds the watched files must stay unchanged before refreshing.
+        """
+        self.refresh()
+        snapshot = self._snapshot()
+        log.info("watching meltano project for schedule changes", paths=[str(p) for p in snapshot])
+        try:
+            while True:
+                time.sleep(poll_interval)
+                current = self._snapshot()
+                if current == snapshot:
+                    continue
+
+                # editors often write in several steps, wait for the files to settle first
+                while True:
+                    time.sleep(debounce)
+                    settled = self._snapshot()
+                    if settled == current:
+                        break
+                    current = settled
+
+                snapshot = current
+                self.refresh()
+        except KeyboardInterrupt:
+            log.info("stopped watching meltano project")
@@ -14,6 +14,14 @@ from meltano.edk import models
 from meltano.edk.extension import ExtensionBase
 from meltano.edk.process import Invoker, log_subprocess_error
 
+from airflow_ext.watcher import (
+    DAG_GENERATOR_NAME,
+    DAG_GENERATOR_SHARD_GLOB,
+    ScheduleWatcher,
+    parse_shard_file_name,
+    shard_file_name,
+)
+
 if sys.version_info >= (3, 12):
     from typing import override
 else:
@@ -21,6 +29,18 @@ else:
 
 log = structlog.get_logger("airflow_extension")
 
+# Keeps Airflow from parsing the full generator when shard stubs import it instead. Valid
+# under both the regexp (Airflow 2 default) and glob (Airflow 3 default) ignore syntaxes.
+GENERATOR_IGNORE_PATTERN = DAG_GENERATOR_NAME
+
+# Marker line of a generator that implements the interface the bundled shard stubs call.
+GENERATOR_SHARD_SUPPORT_MARKER = b"\nSHARD_SUPPORT = 1\n"
+
+
+def _read_orchestrate_file(name: str) -> bytes:
+    """Read one of the bundled orchestrate files."""
+    return importlib.resources.files("airflow_ext.files").joinpath("orchestrate", name).read_bytes()
+
 
 class Airflow(ExtensionBase):
     """Airflow extension implementing the ExtensionBase interface."""
@@ -61,28 +81,29 @@ class Airflow(ExtensionBase):
         self._initdb()
 
     @override
-    def initialize(self, force: bool = False) -> None:
+    def initialize(self, force: bool = False, shards: int | None = None) -> None:
         """Initialize the extension.
 
         Args:
-            force: If True, force initialization where possible (currently no where).
+            force: If True, overwrite the meltano dag generator and its shard stubs.
+            shards: Number of shard stubs to split the meltano dag generator into, so
+                that Airflow can parse the Meltano schedules in parallel. None keeps the
+                current layout.
         """
         self.pre_invoke("initialize", None)
 
         self.airflow_core_dags_path.mkdir(parents=True, exist_ok=True)
 
-        dag_generator_path = self.airflow_core_dags_path / "meltano_dag_generator.py"
-        if not dag_generator_path.exists():
+        dag_generator_path = self.airflow_core_dags_path / DAG_GENERATOR_NAME
+        if force or not dag_generator_path.exists():
             log.warning(
-                "meltano dag generator not found, will be auto-generated",
+                "meltano dag generator not found or forced, will be auto-generated",
                 dag_generator_path=dag_generator_path,
             )
-            dag_generator_path.write_bytes(
-                importlib.resources.read_binary(
-                    "airflow_ext.files",
-                    "orchestrate/meltano.py",
-                )
-            )
+            dag_generator_path.write_bytes(_read_orchestrate_file("meltano.py"))
+
+        if shards is not None:
+            self._install_shards(shards, force)
 
         readme_path = self.airflow_core_dags_path / "README.md"
         if not readme_path.exists():
@@ -90,12 +111,17 @@ class Airflow(ExtensionBase):
                 "meltano dag generator README not found, will be auto-generated",
                 readme_path=readme_path,
             )
-            readme_path.write_bytes(
-                importlib.resources.read_binary(
-                    "airflow_ext.files",
-                    "orchestrate/README.md",
-                ),
-            )
+            readme_path.write_bytes(_read_orchestrate_file("README.md"))
+
+    def watch(self, poll_interval: float = 1.0, debounce: float = 2.0) -> None:
+        """Watch meltano.yml and its include files, refreshing the affected DAGs on change.
+
+        Args:
+            poll_interval: Seconds between checks of the watched files.
+            debounce: Seconds the watched files must stay unchanged before refreshing.
+        """
+        project_root = Path(os.environ.get("MELTANO_PROJECT_ROOT", os.getcwd()))
+        ScheduleWatcher(project_root, self.airflow_core_dags_path).run(poll_interval, debounce)
 
     @override
     def invoke(self, command_name: str | None, *command_args: Any) -> None:
@@ -128,6 +154,52 @@ class Airflow(ExtensionBase):
             ]
         )
 
+    def _install_shards(self, shards: int, force: bool = False) -> None:
+        """Install the meltano dag generator shard stubs.
+
+        With more than one shard, Airflow is told to skip the generator itself via
+        .airflowignore and only parses the stubs, each of which imports it. Stubs left
+        over from a different shard count are removed.
+
+        Args:
+            shards: Number of shard stubs to install, 1 disables sharding.
+            force: If True, overwrite existing shard stubs.
+        """
+        dag_generator_path = self.airflow_core_dags_path / DAG_GENERATOR_NAME
+        if shards > 1 and GENERATOR_SHARD_SUPPORT_MARKER not in dag_generator_path.read_bytes():
+            # an older generator does not accept the shard arguments, and ignoring it in favour
+            # of stubs that fail to import would leave Airflow with no Meltano DAGs
+            log.error(
+                "installed meltano dag generator does not support shards, "
+                "rerun initialize with --force to replace it",
+                dag_generator_path=dag_generator_path,
+            )
+            sys.exit(1)
+
+        shard_paths = (
+            {self.airflow_core_dags_path / shard_file_name(i, shards) for i in range(shards)} if shards > 1 else set()
+        )
+        for stale_path in self.airflow_core_dags_path.glob(DAG_GENERATOR_SHARD_GLOB):
+            if parse_shard_file_name(stale_path.name) is not None and stale_path not in shard_paths:
+                log.info("removing stale meltano dag generator shard", shard_path=stale_path)
+                stale_path.unlink()
+
+        for shard_path in sorted(shard_paths):
+            if force or not shard_path.exists():
+                log.debug("installing meltano dag generator shard", shard_path=shard_path)
+                shard_path.write_bytes(_read_orchestrate_file("meltano_shard.py"))
+
+        airflowignore_path = self.airflow_core_dags_path / ".airflowignore"
+        ignore_lines = airflowignore_path.read_text().splitlines() if airflowignore_path.exists() else []
+        has_ignore = GENERATOR_IGNORE_PATTERN in ignore_lines
+        if shards > 1 and not has_ignore:
+            ignore_lines.append(GENERATOR_IGNORE_PATTERN)
+        elif shards <= 1 and has_ignore:
+            ignore_lines.remove(GENERATOR_IGNORE_PATTERN)
+        else:
+            return
+        airflowignore_path.write_text("".join(f"{line}\n" for line in ignore_lines))
+
     def _create_config(self) -> None:
         self.airflow_cfg_path.parent.mkdir(parents=True, exist_ok=True)
 
@@ -3,12 +3,16 @@
 from __future__ import annotations
 
 import importlib.resources
+import sys
 from typing import TYPE_CHECKING, Any
 
 from airflow.models import DagBag
 
 if TYPE_CHECKING:
     from collections.abc import Callable
+    from pathlib import Path
+
+    import pytest
 
 SCHEDULES_V1 = [
     {
@@ -68,6 +72,22 @@ def _load_dag_bag() -> DagBag:
     return dagbag
 
 
+def _load_sharded_dag_bags(dags_path: Path, shard_count: int) -> list[DagBag]:
+    """Install the generator and its shard stubs into `dags_path` and process each stub."""
+    orchestrate = importlib.resources.files("airflow_ext.files").joinpath("orchestrate")
+    dags_path.mkdir(exist_ok=True)
+    dags_path.joinpath("meltano_dag_generator.py").write_bytes(orchestrate.joinpath("meltano.py").read_bytes())
+
+    dagbags = []
+    for shard_index in range(shard_count):
+        shard_path = dags_path / f"meltano_dag_generator_shard_{shard_index}_of_{shard_count}.py"
+        shard_path.write_bytes(orchestrate.joinpath("meltano_shard.py").read_bytes())
+        dagbag = DagBag(dag_folder=None, collect_dags=False)
+        dagbag.process_file(str(shard_path))
+        dagbags.append(dagbag)
+    return dagbags
+
+
 def test_v1_schedules_produce_valid_dag(meltano_project: Callable[[Any], None]) -> None:
     """A legacy (v1) `meltano schedule list` export generates a DAG with no import errors."""
     meltano_project(SCHEDULES_V1)
@@ -114,3 +134,39 @@ def test_empty_schedules_produce_no_dags(meltano_project: Callable[[Any], None])
 
     assert dagbag.import_errors == {}
     assert dagbag.dags == {}
+
+
+def test_shards_partition_schedules(
+    meltano_project: Callable[[Any], None],
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Every schedule is built by exactly one shard, and together the shards build them all."""
+    monkeypatch.delitem(sys.modules, "meltano_dag_generator", raising=False)
+    monkeypatch.syspath_prepend(str(tmp_path / "dags"))
+    schedules = [{**SCHEDULES_V1[0], "name": f"schedule-{idx}"} for idx in range(8)]
+    meltano_project(schedules)
+
+    dagbags = _load_sharded_dag_bags(tmp_path / "dags", shard_count=3)
+
+    assert all(dagbag.import_errors == {} for dagbag in dagbags)
+    dag_ids = [dag_id for dagbag in dagbags for dag_id in dagbag.dags]
+    assert sorted(dag_ids) == sorted(f"meltano_schedule-{idx}" for idx in range(8))
+
+
+def test_shards_share_cached_schedule_export(
+    meltano_project: Callable[[Any], None],
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Shards reuse a recent schedule export instead of calling meltano again."""
+    monkeypatch.delitem(sys.modules, "meltano_dag_generator", raising=False)
+    monkeypatch.syspath_prepend(str(tmp_path / "dags"))
+    meltano_project(SCHEDULES_V2)
+    _load_sharded_dag_bags(tmp_path / "dags", shard_count=2)
+
+    meltano_project([])
+    dagbags = _load_sharded_dag_bags(tmp_path / "dags", shard_count=2)
+
+    dag_ids = {dag_id for dagbag in dagbags for dag_id in dagbag.dags}
+    assert dag_ids == {"meltano_gitlab-to-postgres", "meltano_daily-job_my-job"}
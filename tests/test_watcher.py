@@ -0,0 +1,185 @@
+"""Validate the schedule watcher behind `airflow_extension watch`."""
+
+from __future__ import annotations
+
+import importlib.resources
+import importlib.util
+import json
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from meltano.edk.process import Invoker
+
+from airflow_ext import watcher as watcher_module
+from airflow_ext.watcher import ScheduleWatcher, schedule_shard
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+SCHEDULE = {
+    "name": "gitlab-to-postgres",
+    "extractor": "tap-gitlab",
+    "loader": "target-postgres",
+    "transform": "run",
+    "interval": "@daily",
+    "cron_interval": "@daily",
+}
+
+
+def _watcher(tmp_path: Path, shard_count: int) -> ScheduleWatcher:
+    """Create a watcher over a dags folder holding `shard_count` stale shard stubs."""
+    dags_path = tmp_path / "dags"
+    dags_path.mkdir()
+    for shard_index in range(shard_count):
+        shard_path = dags_path / f"meltano_dag_generator_shard_{shard_index}_of_{shard_count}.py"
+        shard_path.touch()
+        os.utime(shard_path, (0, 0))
+    return ScheduleWatcher(Path(os.environ["MELTANO_PROJECT_ROOT"]), dags_path)
+
+
+def test_refresh_touches_only_affected_shard(meltano_project: Callable[[Any], None], tmp_path: Path) -> None:
+    """Changing one schedule touches the shard that builds it and leaves the others alone."""
+    meltano_project([SCHEDULE])
+    watcher = _watcher(tmp_path, shard_count=4)
+    assert watcher.refresh() == []
+
+    meltano_project([{**SCHEDULE, "interval": "@hourly", "cron_interval": "@hourly"}])
+    touched = watcher.refresh()
+
+    expected = tmp_path / "dags" / f"meltano_dag_generator_shard_{schedule_shard(SCHEDULE['name'], 4)}_of_4.py"
+    assert touched == [expected]
+    assert [p for p in (tmp_path / "dags").iterdir() if p.stat().st_mtime > 0] == [expected]
+
+
+def test_refresh_updates_schedule_export_cache(meltano_project: Callable[[Any], None], tmp_path: Path) -> None:
+    """The refreshed export is cached for the dag generator shards to reuse."""
+    meltano_project([SCHEDULE])
+    watcher = _watcher(tmp_path, shard_count=2)
+
+    watcher.refresh()
+
+    assert json.loads(watcher.schedule_export_cache.read_text()) == [SCHEDULE]
+
+
+def test_watched_paths_follow_include_paths(meltano_project: Callable[[Any], None], tmp_path: Path) -> None:
+    """Files matched by `include_paths` in meltano.yml are watched alongside it."""
+    meltano_project([])
+    project_root = Path(os.environ["MELTANO_PROJECT_ROOT"])
+    project_root.joinpath("meltano.yml").write_text("include_paths:\n  - ./schedules/*.yml\n")
+    project_root.joinpath("schedules").mkdir()
+    project_root.joinpath("schedules", "daily.yml").write_text("schedules: []\n")
+
+    watcher = _watcher(tmp_path, shard_count=1)
+
+    assert watcher.watched_paths() == [
+        project_root / "meltano.yml",
+        project_root / "schedules" / "daily.yml",
+    ]
+
+
+def test_refresh_ignores_run_state_changes(meltano_project: Callable[[Any], None], tmp_path: Path) -> None:
+    """Run state reported for a schedule does not count as a change to its DAG."""
+    meltano_project([{**SCHEDULE, "last_successful_run_ended_at": None}])
+    watcher = _watcher(tmp_path, shard_count=4)
+    watcher.refresh()
+
+    meltano_project([{**SCHEDULE, "last_successful_run_ended_at": "2026-10-19T00:00:00"}])
+
+    assert watcher.refresh() == []
+    assert all(p.stat().st_mtime == 0 for p in (tmp_path / "dags").iterdir())
+
+
+def test_refresh_skips_stray_shard_files(meltano_project: Callable[[Any], None], tmp_path: Path) -> None:
+    """Files that match the shard glob but are not valid shard names are left alone."""
+    meltano_project([SCHEDULE])
+    watcher = _watcher(tmp_path, shard_count=1)
+    stray_path = tmp_path / "dags" / "meltano_dag_generator_shard_old_of_x.py"
+    stray_path.touch()
+    os.utime(stray_path, (0, 0))
+    watcher.refresh()
+
+    meltano_project([{**SCHEDULE, "interval": "@hourly", "cron_interval": "@hourly"}])
+
+    assert watcher.refresh() == [tmp_path / "dags" / "meltano_dag_generator_shard_0_of_1.py"]
+    assert stray_path.stat().st_mtime == 0
+
+
+def test_refresh_survives_missing_meltano(meltano_project: Callable[[Any], None], tmp_path: Path) -> None:
+    """A missing meltano executable is logged and the watcher keeps its previous schedules."""
+    meltano_project([SCHEDULE])
+    watcher = _watcher(tmp_path, shard_count=2)
+    watcher.refresh()
+    watcher.meltano_invoker = Invoker(str(tmp_path / "missing" / "meltano"))
+
+    assert watcher.refresh() == []
+    assert set(watcher.schedules) == {SCHEDULE["name"]}
+
+
+def test_refresh_survives_unexpected_export(meltano_project: Callable[[Any], None], tmp_path: Path) -> None:
+    """An export that is valid json but not a schedule list is logged and the watcher carries on."""
+    meltano_project([SCHEDULE])
+    watcher = _watcher(tmp_path, shard_count=2)
+    watcher.refresh()
+
+    meltano_project({"unexpected": True})
+
+    assert watcher.refresh() == []
+    assert set(watcher.schedules) == {SCHEDULE["name"]}
+
+
+def test_run_touches_shard_of_edited_schedule(
+    meltano_project: Callable[[Any], None],
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Editing an included file refreshes the schedules once it settles and touches only the affected shard."""
+    other_schedule = {**SCHEDULE, "name": "other-schedule"}
+    shard_count = 4
+    while schedule_shard(other_schedule["name"], shard_count) == schedule_shard(SCHEDULE["name"], shard_count):
+        other_schedule["name"] += "-x"
+    meltano_project([SCHEDULE, other_schedule])
+    project_root = Path(os.environ["MELTANO_PROJECT_ROOT"])
+    project_root.joinpath("meltano.yml").write_text("include_paths:\n  - ./schedules.yml\n")
+    project_root.joinpath("schedules.yml").write_text("schedules: []\n")
+    watcher = _watcher(tmp_path, shard_count=shard_count)
+
+    sleeps = []
+
+    def _sleep(seconds: float) -> None:
+        sleeps.append(seconds)
+        if len(sleeps) == 1:
+            # first poll: the user edits one schedule
+            meltano_project([{**SCHEDULE, "interval": "@hourly", "cron_interval": "@hourly"}, other_schedule])
+            project_root.joinpath("schedules.yml").write_text("schedules: [edited]\n")
+        elif len(sleeps) == 3:
+            raise KeyboardInterrupt
+
+    monkeypatch.setattr(watcher_module.time, "sleep", _sleep)
+
+    watcher.run(poll_interval=1.0, debounce=2.0)
+
+    assert sleeps == [1.0, 2.0, 1.0]
+    expected = tmp_path / "dags" / f"meltano_dag_generator_shard_{schedule_shard(SCHEDULE['name'], 4)}_of_4.py"
+    assert [p for p in (tmp_path / "dags").iterdir() if p.stat().st_mtime > 0] == [expected]
+
+
+def test_watcher_matches_bundled_generator(meltano_project: Callable[[Any], None]) -> None:
+    """The watcher's copies of the shard hash and cache location agree with the dag generator's."""
+    meltano_project([])
+    with importlib.resources.as_file(
+        importlib.resources.files("airflow_ext.files").joinpath("orchestrate", "meltano.py"),
+    ) as dag_generator_path:
+        # loaded under the name shard stubs import it by, so it does not build any DAGs
+        spec = importlib.util.spec_from_file_location("meltano_dag_generator", dag_generator_path)
+        generator = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(generator)
+
+    project_root = Path(os.environ["MELTANO_PROJECT_ROOT"])
+    assert generator.SCHEDULE_EXPORT_CACHE == project_root / watcher_module.SCHEDULE_EXPORT_CACHE
+    for shard_count in (1, 2, 3, 7, 16):
+        for idx in range(50):
+            name = f"schedule-{idx}"
+            assert generator.schedule_shard(name, shard_count) == schedule_shard(name, shard_count)
@@ -0,0 +1,112 @@
+"""Validate how `airflow_extension initialize` installs the meltano dag generator."""
+
+from __future__ import annotations
+
+import importlib.resources
+from pathlib import Path
+
+import pytest
+
+from airflow_ext.wrapper import Airflow
+
+ORCHESTRATE = importlib.resources.files("airflow_ext.files").joinpath("orchestrate")
+
+# Generator as installed by earlier versions of the extension, without shard support.
+LEGACY_GENERATOR = '''"""Meltano DAG generator."""
+
+
+def create_dags() -> None:
+    """Create DAGs for Meltano schedules."""
+
+
+create_dags()
+'''
+
+
+@pytest.fixture
+def dags_path(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Point the extension at an empty dags folder, skipping airflow config and db setup."""
+    monkeypatch.setenv("AIRFLOW_HOME", str(tmp_path / "airflow_home"))
+    monkeypatch.setenv("AIRFLOW__CORE__DAGS_FOLDER", str(tmp_path / "dags"))
+    monkeypatch.setattr(Airflow, "pre_invoke", lambda *args: None)
+    return tmp_path / "dags"
+
+
+def _shard_names(dags_path: Path) -> list[str]:
+    """List the installed shard stubs by file name."""
+    return sorted(p.name for p in dags_path.glob("meltano_dag_generator_shard_*"))
+
+
+def test_changing_shard_count_replaces_stubs(dags_path: Path) -> None:
+    """Going from 3 to 2 to 1 shards leaves only the current stubs and ignore entry behind."""
+    dags_path.mkdir()
+    dags_path.joinpath(".airflowignore").write_text("scratch/\n")
+
+    Airflow().initialize(shards=3)
+    assert _shard_names(dags_path) == [f"meltano_dag_generator_shard_{i}_of_3.py" for i in range(3)]
+    assert dags_path.joinpath(".airflowignore").read_text() == "scratch/\nmeltano_dag_generator.py\n"
+
+    Airflow().initialize(shards=2)
+    assert _shard_names(dags_path) == [f"meltano_dag_generator_shard_{i}_of_2.py" for i in range(2)]
+    assert dags_path.joinpath(".airflowignore").read_text() == "scratch/\nmeltano_dag_generator.py\n"
+
+    Airflow().initialize(shards=1)
+    assert _shard_names(dags_path) == []
+    assert dags_path.joinpath(".airflowignore").read_text() == "scratch/\n"
+    assert dags_path.joinpath("meltano_dag_generator.py").exists()
+
+
+def test_initialize_without_shards_keeps_layout(dags_path: Path) -> None:
+    """Re-running initialize without --shards, as container entrypoints do, leaves sharding in place."""
+    Airflow().initialize(shards=2)
+
+    Airflow().initialize()
+    Airflow().initialize(force=True)
+
+    assert _shard_names(dags_path) == [f"meltano_dag_generator_shard_{i}_of_2.py" for i in range(2)]
+    assert dags_path.joinpath(".airflowignore").read_text() == "meltano_dag_generator.py\n"
+
+
+def test_customized_generator_with_shard_support_is_sharded(dags_path: Path) -> None:
+    """Any generator that declares shard support can be sharded, not just the bundled one."""
+    dags_path.mkdir()
+    dag_generator_path = dags_path / "meltano_dag_generator.py"
+    dag_generator_path.write_bytes(ORCHESTRATE.joinpath("meltano.py").read_bytes() + b"# customized\n")
+
+    Airflow().initialize(shards=2)
+
+    assert dag_generator_path.read_bytes().endswith(b"# customized\n")
+    assert _shard_names(dags_path) == [f"meltano_dag_generator_shard_{i}_of_2.py" for i in range(2)]
+
+
+def test_force_overwrites_stubs(dags_path: Path) -> None:
+    """Existing stubs are kept as-is unless initialization is forced."""
+    Airflow().initialize(shards=2)
+    shard_path = dags_path / "meltano_dag_generator_shard_0_of_2.py"
+    shard_path.write_text("# customized\n")
+
+    Airflow().initialize(shards=2)
+    assert shard_path.read_text() == "# customized\n"
+
+    Airflow().initialize(force=True, shards=2)
+    assert shard_path.read_bytes() == ORCHESTRATE.joinpath("meltano_shard.py").read_bytes()
+
+
+def test_legacy_generator_is_not_sharded(dags_path: Path) -> None:
+    """A generator from an older version is not hidden behind stubs it cannot serve."""
+    dags_path.mkdir()
+    dag_generator_path = dags_path / "meltano_dag_generator.py"
+    dag_generator_path.write_text(LEGACY_GENERATOR)
+
+    with pytest.raises(SystemExit):
+        Airflow().initialize(shards=2)
+
+    assert dag_generator_path.read_text() == LEGACY_GENERATOR
+    assert _shard_names(dags_path) == []
+    assert not dags_path.joinpath(".airflowignore").exists()
+
+    Airflow().initialize(force=True, shards=2)
+
+    assert dag_generator_path.read_bytes() == ORCHESTRATE.joinpath("meltano.py").read_bytes()
+    assert _shard_names(dags_path) == [f"meltano_dag_generator_shard_{i}_of_2.py" for i in range(2)]
+    assert dags_path.joinpath(".airflowignore").read_text() == "meltano_dag_generator.py\n"